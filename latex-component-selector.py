@@ -1,25 +1,251 @@
 import sys
 import re
 import os
+import errno
+import hashlib
+import shutil
 import subprocess
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                            QHBoxLayout, QPushButton, QListWidget, QListWidgetItem,
+                            QHBoxLayout, QPushButton, QListWidget,
                             QCheckBox, QFileDialog, QMessageBox, QLabel, QProgressBar)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import QThread, pyqtSignal
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+_READ_CHUNK_SIZE = 256 * 1024
+_WRITE_BUFFER_SIZE = 256 * 1024
+_LOG_TAIL_SIZE = 128 * 1024
+_MAX_PRINT_LINE = '10000'
+_UNSUPPORTED_COPY_ERRNOS = (errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP)
+
+# Patterns are compiled once at import time rather than on every call.
+_ALL_RE = re.compile(r'\\documentclass\{([^}]+)\}|\\(section|subsection|subsubsection)\*?\{([^}]*)\}')
+_WS_RE = re.compile(r'\s+')
+_COMMAND_PREFIXES = [
+    br'\\documentclass\{',
+    br'\\section\*?\{',
+    br'\\subsection\*?\{',
+    br'\\subsubsection\*?\{'
+]
+_HEAD_TYPES = {
+    'section': ('Section', 1),
+    'subsection': ('Subsection', 2),
+    'subsubsection': ('Subsubsection', 3)
+}
+
+_GRAPHICX_DRAFT_RE = re.compile(r'\\usepackage\[.*?draft.*?\]{graphicx}')
+_DOCUMENTCLASS_DRAFT_RE = re.compile(r'\\documentclass\[(.*?)draft(.*?)\]')
+
+_BEGIN_ENV_RE = re.compile(r'\\begin\{(.*?)\}')
+
+_IMAGE_RES = [
+    re.compile(r'\\includegraphics(?:\[.*?\])?\{(.*?)\}'),
+    re.compile(r'\\graphicspath\{(.*?)\}'),
+    re.compile(r'\\figure\{(.*?)\}')
+]
+
+# TeX prefixes errors with '! ', or with 'file:line: ' under -file-line-error
+_LOG_ERROR_RE = re.compile(
+    r'(?:! |:\d+: )(?:LaTeX Error: (?P<le>[^\n]*)'
+    r'|Package (?P<pkgname>[^ ]+) Error: (?P<pe>[^\n]*)'
+    r'|Missing (?P<miss>[^\n]*)'
+    r'|(?P<uc>Undefined control sequence)'
+    r'|(?P<es>Emergency stop))'
+    r'|No file (?P<nf>[^\n]*)'
+)
+_ERROR_LINE_RE = re.compile(rb'!|.*?:\d+: ')
+_LOG_ERROR_LABELS = {
+    'le': 'LaTeX Error',
+    'pe': 'Package Error',
+    'miss': 'Missing Element',
+    'nf': 'Missing File',
+    'uc': 'Undefined Command',
+    'es': 'Emergency Stop'
+}
+
+
+def _compile_hyperscan_db():
+    """Build a hyperscan database for the command prefixes, if available"""
+    if hyperscan is None:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(expressions=_COMMAND_PREFIXES,
+                   ids=list(range(len(_COMMAND_PREFIXES))),
+                   flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(_COMMAND_PREFIXES))
+        return db
+    except Exception as e:
+        print(f"Error compiling hyperscan database: {e}")
+        return None
+
+
+_HYPERSCAN_DB = _compile_hyperscan_db()
+
+
+def _iter_commands(content, endpos):
+    """Yield _ALL_RE matches in content[:endpos], in order.
+
+    When hyperscan is installed it locates candidate commands with a DFA
+    scan, and each candidate is confirmed with _ALL_RE anchored at its
+    offset. Hyperscan reports byte offsets into the UTF-8 encoding, which
+    are converted to string offsets unless the text is plain ASCII.
+    """
+    if _HYPERSCAN_DB is None:
+        yield from _ALL_RE.finditer(content, 0, endpos)
+        return
+    
+    data = content.encode('utf-8')
+    byte_starts = []
+    def on_match(pattern_id, start, end, flags, context):
+        byte_starts.append(start)
+    _HYPERSCAN_DB.scan(data, match_event_handler=on_match)
+    byte_starts.sort()
+    
+    if content.isascii():
+        starts = byte_starts
+    else:
+        # The starts are sorted, so one forward pass converts them all
+        view = memoryview(data)
+        starts = []
+        byte_pos = char_pos = 0
+        for start in byte_starts:
+            char_pos += len(str(view[byte_pos:start], 'utf-8'))
+            byte_pos = start
+            starts.append(char_pos)
+    
+    last_end = 0
+    for start in starts:
+        if start >= endpos:
+            break
+        if start < last_end:
+            continue
+        match = _ALL_RE.match(content, start, endpos)
+        if match:
+            last_end = match.end()
+            yield match
+
+
+def _is_up_to_date(src_stat, dst):
+    """Check whether dst is already the same file as, or a copy of, the file src_stat describes"""
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    if os.path.samestat(src_stat, dst_stat):
+        return True
+    return (src_stat.st_size == dst_stat.st_size and
+            src_stat.st_mtime_ns == dst_stat.st_mtime_ns)
+
+
+def _copy_fd(fsrc, fdst, size):
+    """Copy size bytes between open files, inside the kernel where possible.
+
+    copy_file_range is tried first, then sendfile. Either one may raise or,
+    on some bind and FUSE mounts, simply copy nothing; in both cases the
+    next method takes over from the current offset, ending with a plain
+    read/write loop.
+    """
+    in_fd = fsrc.fileno()
+    out_fd = fdst.fileno()
+    use_copy_file_range = hasattr(os, 'copy_file_range')
+    use_sendfile = hasattr(os, 'sendfile')
+    offset = 0
+    while offset < size and (use_copy_file_range or use_sendfile):
+        try:
+            if use_copy_file_range:
+                copied = os.copy_file_range(in_fd, out_fd, size - offset, offset, offset)
+            else:
+                os.lseek(out_fd, offset, os.SEEK_SET)
+                copied = os.sendfile(out_fd, in_fd, offset, size - offset)
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_COPY_ERRNOS:
+                raise
+            copied = 0
+        
+        if not copied:
+            if use_copy_file_range:
+                use_copy_file_range = False
+            else:
+                use_sendfile = False
+            continue
+        offset += copied
+    
+    if offset < size:
+        fsrc.seek(offset)
+        fdst.seek(offset)
+        shutil.copyfileobj(fsrc, fdst)
+
+
+def _fast_copy(src, dst, size=None):
+    """Copy a file and its metadata, inside the kernel where the platform allows"""
+    if os.name == 'nt':
+        import ctypes
+        copy_file2 = ctypes.windll.kernel32.CopyFile2
+        copy_file2.restype = ctypes.HRESULT
+        copy_file2(ctypes.c_wchar_p(src), ctypes.c_wchar_p(dst), None)
+        return
+    
+    if sys.platform.startswith('linux'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                if size is None:
+                    size = os.fstat(fsrc.fileno()).st_size
+                _copy_fd(fsrc, fdst, size)
+        except BaseException:
+            # Do not leave an empty or partial image behind
+            try:
+                os.remove(dst)
+            except OSError:
+                pass
+            raise
+    else:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
 
 class LatexParser:
     """Parse LaTeX file to extract components like sections, subsections, etc."""
     
     def __init__(self, file_path):
         self.file_path = file_path
+        self._src_dir = os.path.dirname(file_path)
         self.components = []
         self.full_content = ""
+        self._doc_begin = -1
+        self._doc_end = -1
+        self._components_by_id = {}
+        self._img_cache = {}
+        self._images_dir_ready = False
         
     def read_file(self):
         """Read LaTeX file content"""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                self.full_content = f.read()
+            size = os.path.getsize(self.file_path)
+            buf = bytearray(size)
+            view = memoryview(buf)
+            offset = 0
+            with open(self.file_path, 'rb', buffering=0) as f:
+                while offset < size:
+                    n = f.readinto(view[offset:offset + _READ_CHUNK_SIZE])
+                    if not n:
+                        break
+                    offset += n
+            view.release()
+            del buf[offset:]
+
+            content = buf.decode('utf-8')
+            # Match the newline translation that text mode used to apply
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+            self.full_content = content
+            
+            # Document boundaries are looked up once here; -1 when missing
+            self._doc_begin = content.find('\\begin{document}')
+            self._doc_end = content.find('\\end{document}')
             return True
         except Exception as e:
             print(f"Error reading file: {e}")
@@ -32,67 +258,80 @@ class LatexParser:
             
         self.components = []
    
-        component_patterns = [
-          
-            (r'\\documentclass\{([^}]+)\}', 'Document Class', True),
-          
-            (r'\\section\{([^}]+)\}((?:(?!\\section\{)[\s\S])*)', 'Section', False),
-           
-            (r'\\subsection\{([^}]+)\}((?:(?!\\section\{|\\subsection\{)[\s\S])*)', 'Subsection', False),
-          
-            (r'\\subsubsection\{([^}]+)\}((?:(?!\\section\{|\\subsection\{|\\subsubsection\{)[\s\S])*)', 'Subsubsection', False)
-        ]
-        
-        doc_begin = self.full_content.find('\\begin{document}')
-        doc_end = self.full_content.find('\\end{document}')
+        doc_begin = self._doc_begin
+        doc_end = self._doc_end
         
         if doc_begin == -1:
             doc_begin = 0
         if doc_end == -1:
             doc_end = len(self.full_content)
             
-        document_content = self.full_content[doc_begin:doc_end]
-        
-        for pattern, comp_type, is_preamble in component_patterns:
-        
-            search_text = self.full_content[:doc_begin] if is_preamble else document_content
-            
-            matches = re.finditer(pattern, search_text, re.DOTALL)
-            for i, match in enumerate(matches):
-                try:
-                    title = match.group(1).strip()
-                    
-                
-                    if len(match.groups()) > 1:
-                        content = match.group(0)  
-                    else:
-                        content = match.group(0)
-                    
-                   
-                    title = re.sub(r'\s+', ' ', title).strip()
-                    if len(title) > 50:
-                        title = title[:47] + "..."
-                    
-                    
-                    start = match.start() + (doc_begin if not is_preamble else 0)
-                    end = match.end() + (doc_begin if not is_preamble else 0)
-                    
-                    self.components.append({
-                        'type': comp_type,
-                        'name': title,
-                        'content': content,
-                        'start': start,
-                        'end': end,
-                        'id': f"{comp_type}_{i+1}",
-                        'is_preamble': is_preamble
+        # One pass over everything up to \end{document}. \documentclass only
+        # counts in the preamble and headings only inside the document body.
+        # A heading runs until the next heading of the same or a higher
+        # level, so open headings are kept on a stack and closed as soon as
+        # such a heading is found.
+        counters = {'Document Class': 0, 'Section': 0, 'Subsection': 0, 'Subsubsection': 0}
+        open_heads = []
+        append = self.components.append
+        format_title = self._format_title
+        close_component = self._close_component
+        for match in _iter_commands(self.full_content, doc_end):
+            try:
+                start = match.start()
+                class_name, command, title = match.groups()
+                if class_name is not None:
+                    if start >= doc_begin:
+                        continue
+                    counters['Document Class'] += 1
+                    append({
+                        'type': 'Document Class',
+                        'name': format_title(class_name),
+                        'span': (start, match.end()),
+                        'id': f"Document Class_{counters['Document Class']}",
+                        'is_preamble': True
                     })
-                except Exception as e:
-                    print(f"Error extracting component: {e}")
+                    continue
+                
+                if start < doc_begin:
+                    continue
+                comp_type, level = _HEAD_TYPES[command]
+                
+                while open_heads and open_heads[-1][0] >= level:
+                    close_component(open_heads.pop()[1], start)
+                
+                counters[comp_type] += 1
+                component = {
+                    'type': comp_type,
+                    'name': format_title(title),
+                    'span': (start, doc_end),
+                    'id': f"{comp_type}_{counters[comp_type]}",
+                    'is_preamble': False
+                }
+                append(component)
+                open_heads.append((level, component))
+            except Exception as e:
+                print(f"Error extracting component: {e}")
         
+        while open_heads:
+            close_component(open_heads.pop()[1], doc_end)
         
-        self.components.sort(key=lambda x: x['start'])
+        # Preamble components come first and headings are found in document
+        # order, so the list is already sorted by span start.
+        self._components_by_id = {c['id']: c for c in self.components}
         return True
     
+    def _format_title(self, title):
+        """Collapse whitespace in a component title and shorten long titles"""
+        title = _WS_RE.sub(' ', title).strip()
+        if len(title) > 50:
+            title = title[:47] + "..."
+        return title
+    
+    def _close_component(self, component, end):
+        """Set the end offset of a sectioning component"""
+        component['span'] = (component['span'][0], end)
+    
     def find_component_end(self, start, comp_type):
         """Find the end of a component based on its type"""
         
@@ -111,7 +350,7 @@ class LatexParser:
   
         elif comp_type in ['Figure', 'Table', 'Equation', 'Environment']:
            
-            env_match = re.search(r'\\begin\{(.*?)\}', self.full_content[start:start+50])
+            env_match = _BEGIN_ENV_RE.search(self.full_content[start:start+50])
             if env_match:
                 env_name = env_match.group(1)
                 end_pattern = f"\\end{{{env_name}}}"
@@ -121,103 +360,120 @@ class LatexParser:
         
         return len(self.full_content)
     
+    def _resolve_image(self, img_path, output_dir):
+        """Copy an image into the output directory and return its new relative path"""
+        # join() returns img_path unchanged when it is already absolute
+        original_path = os.path.join(self._src_dir, img_path)
+        
+        key = os.path.realpath(original_path)
+        rel_path = self._img_cache.get(key)
+        if rel_path is not None:
+            return rel_path
+        
+        try:
+            src_stat = os.stat(original_path)
+        except OSError:
+            return None
+        
+        images_dir = os.path.join(output_dir, 'images')
+        if not self._images_dir_ready:
+            os.makedirs(images_dir, exist_ok=True)
+            self._images_dir_ready = True
+        
+        img_filename = os.path.basename(original_path)
+        new_path = os.path.join(images_dir, img_filename)
+        if not _is_up_to_date(src_stat, new_path):
+            _fast_copy(original_path, new_path, src_stat.st_size)
+        
+        rel_path = os.path.join('images', img_filename)
+        self._img_cache[key] = rel_path
+        return rel_path
+    
     def _copy_images(self, content, output_dir):
         """Copy images referenced in the LaTeX content to the output directory"""
-       
-        image_patterns = [
-            r'\\includegraphics(?:\[.*?\])?\{(.*?)\}',  
-            r'\\graphicspath\{(.*?)\}',                 
-            r'\\figure\{(.*?)\}'                        
-        ]
-        
-        modified_content = content
-        for pattern in image_patterns:
-            matches = re.finditer(pattern, content)
-            for match in matches:
-                img_path = match.group(1)
-                if img_path:
-                    
-                    if os.path.isabs(img_path):
-                        original_path = img_path
-                    else:
-                        original_path = os.path.join(os.path.dirname(self.file_path), img_path)
-                    
-                    try:
-                        if os.path.exists(original_path):
-                           
-                            images_dir = os.path.join(output_dir, 'images')
-                            os.makedirs(images_dir, exist_ok=True)
-                            
-                            img_filename = os.path.basename(original_path)
-                            new_path = os.path.join(images_dir, img_filename)
-                            import shutil
-                            shutil.copy2(original_path, new_path)
-                            
-                            rel_path = os.path.join('images', img_filename)
-                            if '\\includegraphics' in match.group(0):
-                                old_cmd = match.group(0)
-                                new_cmd = f'\\includegraphics[width=\\textwidth]{{{rel_path}}}'
-                                modified_content = modified_content.replace(old_cmd, new_cmd)
-                            else:
-                                modified_content = modified_content.replace(img_path, rel_path)
-                    except Exception as e:
-                        print(f"Error copying image {img_path}: {e}")
-        
-        return modified_content
+        
+        def replace(match):
+            img_path = match.group(1)
+            if not img_path:
+                return match.group(0)
+            
+            try:
+                rel_path = self._resolve_image(img_path, output_dir)
+            except Exception as e:
+                print(f"Error copying image {img_path}: {e}")
+                return match.group(0)
+            
+            if rel_path is None:
+                return match.group(0)
+            if '\\includegraphics' in match.group(0):
+                return f'\\includegraphics[width=\\textwidth]{{{rel_path}}}'
+            
+            offset = match.start()
+            return (match.group(0)[:match.start(1) - offset] + rel_path +
+                    match.group(0)[match.end(1) - offset:])
+        
+        for pattern in _IMAGE_RES:
+            content = pattern.sub(replace, content)
+        
+        return content
 
     def generate_custom_tex(self, selected_components, output_file):
         """Generate a new TeX file with only selected components"""
         try:
             
-            doc_begin = self.full_content.find('\\begin{document}')
+            doc_begin = self._doc_begin
             if doc_begin == -1:
                 return False
                 
             preamble = self.full_content[:doc_begin].rstrip()
             
             
-            new_content = []
-            
-          
-            new_content.append(preamble)
-            
-          
+            graphicx_line = None
             if '\\usepackage{graphicx}' not in preamble:
-                new_content.append('\\usepackage[final]{graphicx}') 
+                graphicx_line = '\\usepackage[final]{graphicx}'
             else:
           
-                preamble = re.sub(
-                    r'\\usepackage\[.*?draft.*?\]{graphicx}',
-                    r'\\usepackage[final]{graphicx}',
-                    preamble
-                )
+                if 'draft' in preamble:
+                    preamble = _GRAPHICX_DRAFT_RE.sub(r'\\usepackage[final]{graphicx}', preamble)
             
-           
-            if '\\documentclass[' in preamble:
-                preamble = re.sub(
-                    r'\\documentclass\[(.*?)draft(.*?)\]',
-                    r'\\documentclass[\1final\2]',
-                    preamble
-                )
+            # A plain substring test is much cheaper than a regex that fails
+            if 'draft' in preamble and '\\documentclass[' in preamble:
+                preamble = _DOCUMENTCLASS_DRAFT_RE.sub(r'\\documentclass[\1final\2]', preamble, count=1)
             
             output_dir = os.path.dirname(output_file)
             os.makedirs(output_dir, exist_ok=True)
             
-            new_content.append('\\begin{document}')
+            # Images already copied during this run are resolved from the cache
+            self._img_cache = {}
+            self._images_dir_ready = False
             
             selected_ids = set(comp['id'] for comp in selected_components)
-            for component in self.components:
-                if component['id'] in selected_ids and not component['is_preamble']:
-                    processed_content = self._copy_images(component['content'].strip(), output_dir)
-                    new_content.append('\n' + processed_content)
-            
+            selected = sorted(
+                (self._components_by_id[comp_id] for comp_id in selected_ids
+                 if comp_id in self._components_by_id),
+                key=lambda c: c['span'][0])
             
-            new_content.append('\n\\end{document}\n')
-            
-           
+            # Each piece is encoded and written as it is produced rather than
+            # joining the whole document into one string first.
             try:
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(new_content))
+                with open(output_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                    write = f.write
+                    write(preamble.encode('utf-8'))
+                    if graphicx_line:
+                        write(b'\n' + graphicx_line.encode('utf-8'))
+                    write(b'\n\\begin{document}')
+                    
+                    for component in selected:
+                        if component['is_preamble']:
+                            continue
+                        # Content is sliced only for the components being written
+                        start, end = component['span']
+                        content = self.full_content[start:end]
+                        processed_content = self._copy_images(content.strip(), output_dir)
+                        write(b'\n\n')
+                        write(processed_content.encode('utf-8'))
+                    
+                    write(b'\n\n\\end{document}\n')
                 return True
             except Exception as e:
                 print(f"Error writing new TeX file: {e}")
@@ -242,21 +498,78 @@ class CompilationThread(QThread):
         
     def _check_log_for_errors(self, log_content):
         """Parse log file for common LaTeX errors"""
-        error_patterns = [
-            (r'! LaTeX Error: (.*?)\n', 'LaTeX Error'),
-            (r'! Package (.*?) Error: (.*?)\n', 'Package Error'),
-            (r'! Missing (.*?)\n', 'Missing Element'),
-            (r'No file (.*?)\n', 'Missing File'),
-            (r'! Undefined control sequence', 'Undefined Command'),
-            (r'! Emergency stop', 'Emergency Stop')
-        ]
-        
         errors = []
-        for pattern, error_type in error_patterns:
-            matches = re.finditer(pattern, log_content, re.MULTILINE)
-            for match in matches:
-                errors.append(f"{error_type}: {match.group(1)}")
+        for match in _LOG_ERROR_RE.finditer(log_content):
+            kind = match.lastgroup
+            error_type = _LOG_ERROR_LABELS[kind]
+            if kind == 'pe':
+                errors.append(f"{error_type}: {match.group('pkgname')}: {match.group('pe')}")
+            elif kind in ('uc', 'es'):
+                errors.append(error_type)
+            else:
+                errors.append(f"{error_type}: {match.group(kind)}")
+        
+        return errors
+
+    def _file_digest(self, path):
+        """Return a SHA-1 digest of a file, or None if it does not exist"""
+        try:
+            with open(path, 'rb') as f:
+                return hashlib.sha1(f.read()).digest()
+        except FileNotFoundError:
+            return None
+
+    def _read_log_tail(self):
+        """Read the end of the log file, where pdflatex reports fatal errors"""
+        with open(self.log_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            start = max(0, end - _LOG_TAIL_SIZE)
+            f.seek(start)
+            tail = f.read()
+        
+        if start:
+            # Drop the partial line the window starts in
+            tail = tail[tail.find(b'\n') + 1:]
+        return tail.decode('utf-8', errors='ignore')
+
+    def _run_pdflatex(self, cmd, stop_on_error=False):
+        """Run pdflatex, scanning its output as it is produced.
+
+        TeX starts error lines with '!', or with 'file:line:' when run with
+        -file-line-error. When stop_on_error is set the process is terminated
+        at the first error instead of letting it run to completion. Returns
+        the errors that were found.
+
+        The file is passed relative to the working directory and TeX's line
+        wrapping is widened, so that error lines are not split across lines.
+        """
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=os.path.dirname(self.tex_file),
+            env=dict(os.environ, max_print_line=_MAX_PRINT_LINE)
+        )
         
+        errors = []
+        completed = False
+        try:
+            with process.stdout:
+                for raw_line in process.stdout:
+                    if not _ERROR_LINE_RE.match(raw_line):
+                        continue
+                    line = raw_line.decode('utf-8', errors='ignore')
+                    errors.extend(self._check_log_for_errors(line))
+                    if errors and stop_on_error:
+                        break
+                else:
+                    completed = True
+        finally:
+            # Never leave pdflatex running after an early stop or an exception
+            if not completed and process.poll() is None:
+                process.terminate()
+            process.wait()
         return errors
 
     def _compile_latex(self):
@@ -273,34 +586,29 @@ class CompilationThread(QThread):
                 '-halt-on-error',
                 '-no-pdf',  
                 f'-output-directory={self.output_dir}',
-                self.tex_file
+                os.path.basename(self.tex_file)
             ]
             
             self.update_status.emit("Running first compilation pass...")
             self.update_progress.emit(20)
             
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=os.path.dirname(self.tex_file)
-            )
-            
-            stdout, stderr = process.communicate()
+            errors = self._run_pdflatex(cmd, stop_on_error=True)
+            if errors:
+                error_msg = "\n".join(errors)
+                self.update_status.emit(f"LaTeX Errors Found:\n{error_msg}")
+                return False, error_msg
             
           
             base_name = os.path.splitext(os.path.basename(self.tex_file))[0]
             self.log_file = os.path.join(self.output_dir, f"{base_name}.log")
             
             if os.path.exists(self.log_file):
-                with open(self.log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    log_content = f.read()
-                    errors = self._check_log_for_errors(log_content)
-                    if errors:
-                        error_msg = "\n".join(errors)
-                        self.update_status.emit(f"LaTeX Errors Found:\n{error_msg}")
-                        return False, error_msg
+                log_content = self._read_log_tail()
+                errors = self._check_log_for_errors(log_content)
+                if errors:
+                    error_msg = "\n".join(errors)
+                    self.update_status.emit(f"LaTeX Errors Found:\n{error_msg}")
+                    return False, error_msg
             
             self.update_progress.emit(40)
             
@@ -310,32 +618,20 @@ class CompilationThread(QThread):
                 '-interaction=nonstopmode',
                 '-file-line-error',
                 f'-output-directory={self.output_dir}',
-                self.tex_file
+                os.path.basename(self.tex_file)
             ]
             
+            aux_file = os.path.join(self.output_dir, f"{base_name}.aux")
+            aux_digest = self._file_digest(aux_file)
+            
             self.update_status.emit("Generating PDF...")
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=os.path.dirname(self.tex_file)
-            )
-            
-            stdout, stderr = process.communicate()
+            self._run_pdflatex(cmd)
             self.update_progress.emit(80)
             
-         
-            self.update_status.emit("Finalizing references...")
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=os.path.dirname(self.tex_file)
-            )
-            
-            stdout, stderr = process.communicate()
+            # References only need another pass if the last one changed the .aux
+            if self._file_digest(aux_file) != aux_digest:
+                self.update_status.emit("Finalizing references...")
+                self._run_pdflatex(cmd)
             
             pdf_file = os.path.join(self.output_dir, f"{base_name}.pdf")
             if os.path.exists(pdf_file) and os.path.getsize(pdf_file) > 0:
@@ -364,6 +660,39 @@ class CompilationThread(QThread):
             self.finished.emit(False, str(e))
 
 
+class ParseThread(QThread):
+    """Thread for reading a LaTeX file and extracting its components"""
+    update_status = pyqtSignal(str)
+    update_progress = pyqtSignal(int)
+    finished = pyqtSignal(bool, str)
+    
+    def __init__(self, parser):
+        super().__init__()
+        self.parser = parser
+        
+    def run(self):
+        """Run the parsing process"""
+        try:
+            if not self.parser.read_file():
+                self.update_status.emit("Error reading file")
+                self.finished.emit(False, "Could not read LaTeX file")
+                return
+                
+            self.update_progress.emit(40)
+            
+            if not self.parser.extract_components():
+                self.update_status.emit("Error extracting components")
+                self.finished.emit(False, "Could not extract components from LaTeX file")
+                return
+                
+            self.update_progress.emit(70)
+            self.finished.emit(True, self.parser.file_path)
+            
+        except Exception as e:
+            self.update_status.emit(f"System Error: {str(e)}")
+            self.finished.emit(False, str(e))
+
+
 class LatexComponentSelector(QMainWindow):
     """Main GUI application for selecting and printing LaTeX components"""
     
@@ -371,6 +700,7 @@ class LatexComponentSelector(QMainWindow):
         super().__init__()
         self.parser = None
         self.selected_components = []
+        self._row_data = []
         self.initUI()
         
     def initUI(self):
@@ -437,25 +767,26 @@ class LatexComponentSelector(QMainWindow):
         """Load components from the LaTeX file"""
         self.status_label.setText("Loading components...")
         self.progress_bar.setValue(10)
+        self.browse_button.setEnabled(False)
+        self.generate_button.setEnabled(False)
         
        
         self.parser = LatexParser(file_path)
         
-       
-        if not self.parser.read_file():
-            self.status_label.setText("Error reading file")
-            QMessageBox.critical(self, "Error", "Could not read LaTeX file")
-            return
-            
-        self.progress_bar.setValue(40)
         
-
-        if not self.parser.extract_components():
-            self.status_label.setText("Error extracting components")
-            QMessageBox.critical(self, "Error", "Could not extract components from LaTeX file")
+        self.parse_thread = ParseThread(self.parser)
+        self.parse_thread.update_status.connect(self.status_label.setText)
+        self.parse_thread.update_progress.connect(self.progress_bar.setValue)
+        self.parse_thread.finished.connect(self.parsing_finished)
+        self.parse_thread.start()
+        
+    def parsing_finished(self, success, message):
+        """Handle parsing finished"""
+        self.browse_button.setEnabled(True)
+        
+        if not success:
+            QMessageBox.critical(self, "Error", message)
             return
-            
-        self.progress_bar.setValue(70)
         
        
         self.display_components()
@@ -467,15 +798,21 @@ class LatexComponentSelector(QMainWindow):
     def display_components(self):
         """Display components in the list widget"""
         self.component_list.clear()
+        self._row_data = []
         
         if not self.parser or not self.parser.components:
             return
-            
-        for component in self.parser.components:
-            item_text = f"{component['type']}: {component['name']}"
-            item = QListWidgetItem(item_text)
-            item.setData(Qt.UserRole, component)
-            self.component_list.addItem(item)
+        
+        # Components are looked up by row, so the list only holds display text
+        self._row_data = self.parser.components
+        self.component_list.setUpdatesEnabled(False)
+        self.component_list.blockSignals(True)
+        try:
+            self.component_list.addItems(
+                [f"{c['type']}: {c['name']}" for c in self._row_data])
+        finally:
+            self.component_list.blockSignals(False)
+            self.component_list.setUpdatesEnabled(True)
             
     def select_all_components(self):
         """Select all components"""
@@ -493,8 +830,7 @@ class LatexComponentSelector(QMainWindow):
         for i in range(self.component_list.count()):
             item = self.component_list.item(i)
             if item.isSelected():
-                component = item.data(Qt.UserRole)
-                selected_components.append(component)
+                selected_components.append(self._row_data[i])
                 
         return selected_components
             
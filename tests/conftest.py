@@ -0,0 +1,17 @@
+import importlib.util
+import os
+
+import pytest
+
+MODULE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'latex-component-selector.py')
+
+
+@pytest.fixture
+def selector():
+    """Load latex-component-selector.py, whose name is not importable"""
+    pytest.importorskip('PyQt5')
+    spec = importlib.util.spec_from_file_location('latex_component_selector', MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,116 @@
+import os
+import shutil
+import signal
+import stat
+import subprocess
+import tempfile
+import time
+
+import pytest
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason="stand-in pdflatex is a shell script")
+
+
+def fake_pdflatex(tmp_path, monkeypatch, body):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    script = bin_dir / 'pdflatex'
+    script.write_text('#!/bin/sh\n' + body)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+
+def started_processes(monkeypatch, module):
+    processes = []
+    popen = subprocess.Popen
+
+    def record(*args, **kwargs):
+        process = popen(*args, **kwargs)
+        processes.append(process)
+        return process
+
+    monkeypatch.setattr(module.subprocess, 'Popen', record)
+    return processes
+
+
+def test_first_pass_stops_on_file_line_error(selector, tmp_path, monkeypatch):
+    fake_pdflatex(tmp_path, monkeypatch,
+                  'echo "This is pdfTeX"\n'
+                  'echo "./custom_report.tex:12: Undefined control sequence."\n'
+                  'exec sleep 30\n')
+    processes = started_processes(monkeypatch, selector)
+
+    tex_file = tmp_path / 'custom_report.tex'
+    tex_file.write_text('')
+    thread = selector.CompilationThread(str(tex_file), str(tmp_path / 'out'))
+
+    start = time.monotonic()
+    errors = thread._run_pdflatex(['pdflatex', str(tex_file)], stop_on_error=True)
+
+    assert errors == ['Undefined Command']
+    assert time.monotonic() - start < 10
+    assert processes[0].returncode == -signal.SIGTERM
+
+
+def test_first_pass_stops_on_error_under_long_path(selector, tmp_path, monkeypatch, request):
+    # Mimics TeX: the error names the file as given and output wraps at
+    # max_print_line columns (79 unless overridden in the environment).
+    fake_pdflatex(tmp_path, monkeypatch,
+                  'for arg in "$@"; do file="$arg"; done\n'
+                  'printf \'%s:12: Undefined control sequence.\\n\' "$file"'
+                  ' | fold -w "${max_print_line:-79}"\n'
+                  'exec sleep 30\n')
+    processes = started_processes(monkeypatch, selector)
+
+    # Size the path so the 79-column wrap splits the error message itself
+    base_dir = tempfile.mkdtemp(prefix='out', dir='/tmp')
+    request.addfinalizer(lambda: shutil.rmtree(base_dir, ignore_errors=True))
+    padding = 70 - len(base_dir) - len('//custom_report.tex')
+    output_dir = os.path.join(base_dir, 'd' * padding)
+    os.makedirs(output_dir)
+    tex_file = os.path.join(output_dir, 'custom_report.tex')
+    open(tex_file, 'w').close()
+    assert len(tex_file) == 70
+    thread = selector.CompilationThread(tex_file, output_dir)
+
+    success, message = thread._compile_latex()
+
+    assert not success
+    assert message == 'Undefined Command'
+    assert len(processes) == 1
+    assert processes[0].returncode == -signal.SIGTERM
+
+
+def test_process_is_reaped_when_scanning_fails(selector, tmp_path, monkeypatch):
+    fake_pdflatex(tmp_path, monkeypatch,
+                  'echo "./custom_report.tex:3: LaTeX Error: File foo.sty not found."\n'
+                  'exec sleep 30\n')
+    processes = started_processes(monkeypatch, selector)
+
+    def fail(log_content):
+        raise RuntimeError("scan failed")
+
+    tex_file = tmp_path / 'custom_report.tex'
+    tex_file.write_text('')
+    thread = selector.CompilationThread(str(tex_file), str(tmp_path / 'out'))
+    monkeypatch.setattr(thread, '_check_log_for_errors', fail)
+
+    with pytest.raises(RuntimeError):
+        thread._run_pdflatex(['pdflatex', str(tex_file)], stop_on_error=True)
+
+    assert processes[0].returncode == -signal.SIGTERM
+
+
+def test_file_line_errors_in_log(selector):
+    thread = selector.CompilationThread('custom_report.tex', 'out')
+    log = ("./custom_report.tex:3: LaTeX Error: File `foo.sty' not found.\n"
+           "./custom_report.tex:5: Package babel Error: Unknown option `x'.\n"
+           "./custom_report.tex:7: Missing $ inserted.\n"
+           "./custom_report.tex:9: Emergency stop.\n")
+
+    assert thread._check_log_for_errors(log) == [
+        "LaTeX Error: File `foo.sty' not found.",
+        "Package Error: babel: Unknown option `x'.",
+        "Missing Element: $ inserted.",
+        "Emergency Stop",
+    ]
@@ -0,0 +1,113 @@
+def parse(selector, tmp_path, text):
+    tex_file = tmp_path / 'doc.tex'
+    tex_file.write_text(text)
+    parser = selector.LatexParser(str(tex_file))
+    assert parser.read_file()
+    assert parser.extract_components()
+    return [(c['id'], c['span']) for c in parser.components]
+
+
+def test_nested_headings(selector, tmp_path):
+    text = ("\\documentclass{article}\n\\begin{document}\n"
+            "\\section{A}\na\n\\subsection{A1}\nb\n\\subsubsection{A1a}\nc\n"
+            "\\section{B}\nd\n\\end{document}\n")
+    s_a = text.index('\\section{A}')
+    s_a1 = text.index('\\subsection{A1}')
+    s_a1a = text.index('\\subsubsection{A1a}')
+    s_b = text.index('\\section{B}')
+    end = text.index('\\end{document}')
+
+    assert parse(selector, tmp_path, text) == [
+        ('Document Class_1', (0, len('\\documentclass{article}'))),
+        ('Section_1', (s_a, s_b)),
+        ('Subsection_1', (s_a1, s_b)),
+        ('Subsubsection_1', (s_a1a, s_b)),
+        ('Section_2', (s_b, end)),
+    ]
+
+
+def test_subsubsection_followed_by_subsection(selector, tmp_path):
+    text = ("\\begin{document}\n\\section{A}\n\\subsection{A1}\n"
+            "\\subsubsection{A1a}\nx\n\\subsection{A2}\ny\n\\end{document}\n")
+    s_a = text.index('\\section{A}')
+    s_a1 = text.index('\\subsection{A1}')
+    s_a1a = text.index('\\subsubsection{A1a}')
+    s_a2 = text.index('\\subsection{A2}')
+    end = text.index('\\end{document}')
+
+    assert parse(selector, tmp_path, text) == [
+        ('Section_1', (s_a, end)),
+        ('Subsection_1', (s_a1, s_a2)),
+        ('Subsubsection_1', (s_a1a, s_a2)),
+        ('Subsection_2', (s_a2, end)),
+    ]
+
+
+def test_starred_and_empty_headings(selector, tmp_path):
+    text = ("\\begin{document}\n\\section{A}\na\n\\section*{Unnumbered}\nb\n"
+            "\\subsection{}\nc\n\\end{document}\n")
+    s_a = text.index('\\section{A}')
+    s_star = text.index('\\section*{Unnumbered}')
+    s_empty = text.index('\\subsection{}')
+    end = text.index('\\end{document}')
+
+    tex_file = tmp_path / 'doc.tex'
+    tex_file.write_text(text)
+    parser = selector.LatexParser(str(tex_file))
+    parser.read_file()
+    parser.extract_components()
+
+    assert [(c['id'], c['name'], c['span']) for c in parser.components] == [
+        ('Section_1', 'A', (s_a, s_star)),
+        ('Section_2', 'Unnumbered', (s_star, end)),
+        ('Subsection_1', '', (s_empty, end)),
+    ]
+
+
+def test_heading_in_preamble_is_ignored(selector, tmp_path):
+    text = ("\\documentclass{article}\n\\newcommand{\\intro}{\\section{Intro}}\n"
+            "\\begin{document}\n\\section{A}\n\\end{document}\n")
+    s_a = text.index('\\section{A}')
+    end = text.index('\\end{document}')
+
+    assert parse(selector, tmp_path, text) == [
+        ('Document Class_1', (0, len('\\documentclass{article}'))),
+        ('Section_1', (s_a, end)),
+    ]
+
+
+def test_documentclass_in_body_is_ignored(selector, tmp_path):
+    text = ("\\documentclass{article}\n\\begin{document}\n\\section{A}\n"
+            "\\verb|\\documentclass{book}|\n\\end{document}\n")
+    s_a = text.index('\\section{A}')
+    end = text.index('\\end{document}')
+
+    assert parse(selector, tmp_path, text) == [
+        ('Document Class_1', (0, len('\\documentclass{article}'))),
+        ('Section_1', (s_a, end)),
+    ]
+
+
+def test_missing_begin_document(selector, tmp_path):
+    # Without \begin{document} the whole file is treated as the body
+    text = "\\documentclass{article}\n\\section{A}\na\n\\section{B}\nb\n\\end{document}\n"
+    s_a = text.index('\\section{A}')
+    s_b = text.index('\\section{B}')
+    end = text.index('\\end{document}')
+
+    assert parse(selector, tmp_path, text) == [
+        ('Section_1', (s_a, s_b)),
+        ('Section_2', (s_b, end)),
+    ]
+
+
+def test_missing_end_document(selector, tmp_path):
+    text = "\\documentclass{article}\n\\begin{document}\n\\section{A}\na\n\\subsection{A1}\nb\n"
+    s_a = text.index('\\section{A}')
+    s_a1 = text.index('\\subsection{A1}')
+
+    assert parse(selector, tmp_path, text) == [
+        ('Document Class_1', (0, len('\\documentclass{article}'))),
+        ('Section_1', (s_a, len(text))),
+        ('Subsection_1', (s_a1, len(text))),
+    ]
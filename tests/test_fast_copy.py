@@ -0,0 +1,70 @@
+import errno
+import os
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith('linux'),
+                                reason="kernel copy fallbacks are Linux-only")
+
+
+@pytest.fixture
+def image(tmp_path):
+    src = tmp_path / 'logo.png'
+    src.write_bytes(os.urandom(5000))
+    return src
+
+
+def unsupported(*args):
+    raise OSError(errno.EINVAL, "not supported")
+
+
+def test_copy_file_range_copying_nothing_falls_back(selector, image, tmp_path, monkeypatch):
+    monkeypatch.setattr(selector.os, 'copy_file_range', lambda *args: 0, raising=False)
+    dst = tmp_path / 'copy.png'
+
+    selector._fast_copy(str(image), str(dst))
+
+    assert dst.read_bytes() == image.read_bytes()
+
+
+def test_sendfile_failure_falls_back_to_read_write(selector, image, tmp_path, monkeypatch):
+    monkeypatch.setattr(selector.os, 'copy_file_range', lambda *args: 0, raising=False)
+    monkeypatch.setattr(selector.os, 'sendfile', unsupported, raising=False)
+    dst = tmp_path / 'copy.png'
+
+    selector._fast_copy(str(image), str(dst))
+
+    assert dst.read_bytes() == image.read_bytes()
+
+
+def test_partial_kernel_copy_is_completed(selector, image, tmp_path, monkeypatch):
+    copy_file_range = os.copy_file_range
+    calls = []
+
+    def copy_once(in_fd, out_fd, count, offset_src=None, offset_dst=None):
+        calls.append(count)
+        if len(calls) > 1:
+            return 0
+        return copy_file_range(in_fd, out_fd, 1000, offset_src, offset_dst)
+
+    monkeypatch.setattr(selector.os, 'copy_file_range', copy_once)
+    monkeypatch.setattr(selector.os, 'sendfile', unsupported, raising=False)
+    dst = tmp_path / 'copy.png'
+
+    selector._fast_copy(str(image), str(dst))
+
+    assert dst.read_bytes() == image.read_bytes()
+
+
+def test_failed_copy_leaves_no_file(selector, image, tmp_path, monkeypatch):
+    def broken(*args):
+        raise OSError(errno.EIO, "I/O error")
+
+    monkeypatch.setattr(selector.os, 'copy_file_range', broken, raising=False)
+    dst = tmp_path / 'copy.png'
+
+    with pytest.raises(OSError):
+        selector._fast_copy(str(image), str(dst))
+
+    assert not dst.exists()
@@ -0,0 +1,71 @@
+import re
+
+import pytest
+
+
+class StubDatabase:
+    """Stands in for a compiled hyperscan database, reporting the same events"""
+
+    def __init__(self, expressions):
+        self.patterns = [re.compile(expression) for expression in expressions]
+        self.scans = 0
+
+    def scan(self, data, match_event_handler):
+        assert isinstance(data, bytes)
+        self.scans += 1
+        events = []
+        for pattern_id, pattern in enumerate(self.patterns):
+            for match in pattern.finditer(data):
+                events.append((match.end(), pattern_id, match.start()))
+        # hyperscan reports matches in order of their end offset
+        for end, pattern_id, start in sorted(events):
+            match_event_handler(pattern_id, start, end, 0, None)
+
+
+DOCUMENTS = [
+    "\\documentclass{article}\n\\begin{document}\n\\section{A}\n\\subsection*{B}\n"
+    "\\subsubsection{C}\n\\end{document}\n",
+    # A title that contains another heading prefix overlaps the next candidate
+    "\\section{A \\section{B}\n\\subsection{}\n",
+    # Non-ASCII text before and between commands shifts byte offsets
+    "\\documentclass{article}\n\u00e9t\u00e9 \u2014 \u201cquoted\u201d\n\\section{R\u00e9sum\u00e9}\n"
+    "\u00fc\u00f1\u00ee\u00e7\u00f8d\u00e9 \U0001d400\n\\subsection{Na\u00efve}\nx\n",
+    "\\documentclass{}\n\\section no brace\n\\section{Unclosed\n",
+]
+
+
+@pytest.fixture
+def stub_hyperscan(selector, monkeypatch):
+    monkeypatch.setattr(selector, '_HYPERSCAN_DB', StubDatabase(selector._COMMAND_PREFIXES))
+    return selector
+
+
+def spans(matches):
+    return [(m.span(), m.groups()) for m in matches]
+
+
+@pytest.mark.parametrize('content', DOCUMENTS)
+def test_hyperscan_path_matches_re(stub_hyperscan, content):
+    selector = stub_hyperscan
+    for endpos in (len(content), len(content) // 2, 0):
+        expected = spans(selector._ALL_RE.finditer(content, 0, endpos))
+        assert spans(selector._iter_commands(content, endpos)) == expected
+    assert selector._HYPERSCAN_DB.scans == 3
+
+
+def test_hyperscan_path_extracts_same_components(stub_hyperscan, monkeypatch, tmp_path):
+    selector = stub_hyperscan
+    tex_file = tmp_path / 'doc.tex'
+    tex_file.write_text(DOCUMENTS[2].replace('\\section', '\\begin{document}\n\\section', 1),
+                        encoding='utf-8')
+
+    parser = selector.LatexParser(str(tex_file))
+    parser.read_file()
+    parser.extract_components()
+    with_hyperscan = parser.components
+
+    monkeypatch.setattr(selector, '_HYPERSCAN_DB', None)
+    parser.extract_components()
+
+    assert with_hyperscan == parser.components
+    assert [c['name'] for c in parser.components] == ['article', 'R\u00e9sum\u00e9', 'Na\u00efve']